@@ -9,9 +9,30 @@ Use Case: Find CEOs in Colorado, but intelligently narrow down
 to the most relevant audience based on company characteristics.
 """
 
+import argparse
+import copy
+import functools
+import logging
+import time
 import requests
 import json
-from anthropic import Anthropic
+import orjson
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from anthropic import Anthropic, APIError
+from instantly_http import make_instantly_session
+from prompts import (
+    FILTER_SCHEMA_BLOCK,
+    JSON_ONLY_SYSTEM,
+    JSON_STOP_SEQUENCES,
+    canonical_json,
+    parse_json_object,
+    stream_json
+)
+
+
+log = logging.getLogger(__name__)
 
 
 # ============================================================================
@@ -22,128 +43,462 @@ ANTHROPIC_API_KEY = "your_anthropic_api_key_here"
 
 BASE_URL = "https://api.instantly.ai/api/v2"
 MAX_ITERATIONS = 5
+BATCH_POLL_SECONDS = 30
+SEARCH_MEMORY_SIZE = 8  # most recent tried/rejected changes sent to the model
+
+# Lead count we're refining towards
+TARGET_MIN = 500
+TARGET_MAX = 2000
+STABLE_COUNT_CHANGE = 0.05  # relative change still treated as "settled"
+PROMPT_CACHE_MIN_TOKENS = 1024  # shortest prefix the model will cache
+
+# Starting points previewed side by side before the iterative loop
+SEED_COMPANY_SIZES = [
+    {"min": 1, "max": 50},
+    {"min": 51, "max": 200},
+    {"min": 201, "max": 1000}
+]
+
+# Starting filters - deliberately broad
+INITIAL_FILTERS = {
+    "locations": {
+        "include": [{"country": "US", "state": "CO"}],
+        "exclude": []
+    },
+    "job_titles": {
+        "include": ["CEO", "Chief Executive Officer", "Founder", "Co-Founder"],
+        "exclude": ["Assistant", "Associate"]
+    },
+    "management_levels": ["c_level"]
+}
+
+# Shared session so every preview/enrichment call reuses the same
+# keep-alive connection and the same retry rules
+_SESSION = make_instantly_session(INSTANTLY_API_KEY, BASE_URL)
+
+# Created on first use and shared, so each AI call reuses one HTTP client
+_ANTHROPIC: Optional[Anthropic] = None
+
+# Background workers for previews that can overlap with other waiting
+# (e.g. the user reading suggestions); sized to fit the session's pool
+_PREVIEW_POOL = ThreadPoolExecutor(max_workers=8)
+
+
+# ============================================================================
+# Prompts
+# ============================================================================
+
+# Built from TARGET_MIN/TARGET_MAX so the prompts and the in-range checks agree
+_TARGET_RANGE_TEXT = f"{TARGET_MIN:,}-{TARGET_MAX:,}"
+
+# Static instructions, sent first and marked cacheable: kept as one constant
+# so the cached prefix is byte-identical on every call
+_REFINE_PROMPT_STATIC = f"""You're helping refine a lead search in Instantly.ai SuperSearch.
+
+TARGET RANGE: {_TARGET_RANGE_TEXT} leads (optimal for manageable enrichment)
+
+AVAILABLE FILTERS (set, add to, or remove any of these):
+""" + FILTER_SCHEMA_BLOCK + f"""
+
+ANALYSIS NEEDED:
+1. Is the current count in the optimal range ({_TARGET_RANGE_TEXT})?
+""" + """2. If not, what's the most impactful filter adjustment?
+3. Are we converging on the right target or should we pivot?
+
+SEARCH MEMORY lists recent changes ("tried", with the lead count each one
+produced on its own) and changes the user rejected. Do not re-propose a
+change that is already in "tried" or "rejected".
+
+Respond ONLY with valid JSON:
+{
+  "status": "optimal|too_many|too_few",
+  "recommendation": "proceed|refine|pivot",
+  "reasoning": "one sentence explanation",
+  "suggested_changes": [
+    {
+      "filter": "company_size",
+      "action": "set",
+      "value": {"min": 20, "max": 150},
+      "rationale": "why this helps"
+    }
+  ],
+  "estimated_impact": "how this will affect lead count",
+  "confidence": "high|medium|low"
+}"""
+
+# Per-iteration details, appended after the cached prefix
+_REFINE_PROMPT_DYNAMIC = Template("""GOAL: $goal
+
+CURRENT STATUS:
+• Iteration: $iteration
+• Current Count: $count leads
+
+SEARCH MEMORY:
+$memory_json
+
+CURRENT FILTERS:
+$filters_json""")
+
+# Picks the best of the seed variants in a single call
+_SEED_PROMPT_STATIC = f"""You're choosing a starting point for a lead search in Instantly.ai SuperSearch.
+
+TARGET RANGE: {_TARGET_RANGE_TEXT} leads (optimal for manageable enrichment)
+
+Several variants of the same search were previewed; they differ only in
+company_size. Pick the variant that best fits the goal and, if its count
+is outside the target range, suggest the changes most likely to bring it in.
+
+AVAILABLE FILTERS (set, add to, or remove any of these):
+""" + FILTER_SCHEMA_BLOCK + """
+
+Respond ONLY with valid JSON:
+{
+  "seed": 1,
+  "reasoning": "one sentence explanation",
+  "suggested_changes": [
+    {
+      "filter": "industries",
+      "action": "add",
+      "value": ["Technology"],
+      "rationale": "why this helps"
+    }
+  ]
+}"""
+
+_SEED_PROMPT_DYNAMIC = Template("""GOAL: $goal
+
+SHARED FILTERS:
+$filters_json
+
+VARIANTS:
+$variants""")
 
 
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
+class _LazyJSON:
+    """Log argument that is only pretty-printed if the record is emitted"""
+    
+    __slots__ = ("data",)
+    
+    def __init__(self, data):
+        self.data = data
+    
+    def __str__(self) -> str:
+        return json.dumps(self.data, indent=2)
+
+
 def preview_search(filters: dict) -> dict:
     """Preview search results without spending credits"""
-    response = requests.post(
+    # lru_cache can't hash dicts, so key on canonical JSON of the filters
+    return _preview_cached(canonical_json(filters))
+
+
+@functools.lru_cache(maxsize=128)
+def _preview_cached(filters_json: bytes) -> dict:
+    """POST a preview for canonical filter JSON; repeats are served from memory"""
+    # The key already is the serialized filters, so splice it straight into
+    # the request body rather than decoding and re-encoding it
+    response = _SESSION.post(
         f"{BASE_URL}/supersearch-enrichment/preview-leads-from-supersearch",
-        headers={
-            "Authorization": f"Bearer {INSTANTLY_API_KEY}",
-            "Content-Type": "application/json"
-        },
-        json={"search_filters": filters}
+        data=b'{"search_filters":%b}' % filters_json
     )
     response.raise_for_status()
     return response.json()
 
 
-def get_ai_refinement_suggestions(
+def _get_anthropic() -> Anthropic:
+    """Shared Anthropic client"""
+    global _ANTHROPIC
+    if _ANTHROPIC is None:
+        _ANTHROPIC = Anthropic(api_key=ANTHROPIC_API_KEY)
+    return _ANTHROPIC
+
+
+def check_prompt_budget() -> int:
+    """
+    Count the tokens in the static prompt prefix and warn if it's too
+    short for prompt caching to kick in (run via --check-prompt-cache)
+    """
+    tokens = _get_anthropic().messages.count_tokens(
+        model="claude-sonnet-4-20250514",
+        system=JSON_ONLY_SYSTEM,
+        messages=[{"role": "user", "content": _REFINE_PROMPT_STATIC}]
+    ).input_tokens
+    
+    print(f"Static prompt prefix: {tokens:,} tokens")
+    if tokens < PROMPT_CACHE_MIN_TOKENS:
+        print(f"ℹ️  Static prompt prefix is {tokens:,} tokens - below the "
+              f"{PROMPT_CACHE_MIN_TOKENS:,}-token minimum, so it won't be cached")
+    
+    return tokens
+
+
+def _preview_count(filters: dict) -> Optional[int]:
+    """Lead count for a candidate filter set, or None if the preview failed"""
+    try:
+        return preview_search(filters).get("count", 0)
+    except requests.RequestException:
+        return None
+
+
+def new_search_memory() -> dict:
+    """Empty search memory for a refinement session"""
+    return {"tried": [], "rejected": [], "best_so_far": None}
+
+
+def _distance_from_target(count: int) -> int:
+    """How many leads ``count`` is outside the target range (0 if inside)"""
+    return max(TARGET_MIN - count, count - TARGET_MAX, 0)
+
+
+def record_count(search_memory: dict, iteration: int, count: int) -> None:
+    """Track the iteration whose count was closest to the target range"""
+    best = search_memory["best_so_far"]
+    if best is None or _distance_from_target(count) < _distance_from_target(best["count"]):
+        search_memory["best_so_far"] = {"iteration": iteration, "count": count}
+
+
+def record_changes(
+    search_memory: dict,
+    iteration: int,
+    changes: list,
+    count_before: Optional[int],
+    counts_after: list,
+    outcome: str
+) -> None:
+    """
+    Remember suggested changes and what happened to them.
+    
+    ``counts_after`` holds the lead count each change produced on its own;
+    ``outcome`` is "applied", "rejected" or "seed". Only the most recent
+    SEARCH_MEMORY_SIZE entries are kept so the prompt stays a fixed size.
+    """
+    for change, count_after in zip(changes, counts_after):
+        delta = {key: change.get(key) for key in ("filter", "action", "value")}
+        search_memory["tried"].append({
+            "iteration": iteration,
+            "change": delta,
+            "count_before": count_before,
+            "count_after": count_after,
+            "outcome": outcome
+        })
+        if outcome == "rejected":
+            search_memory["rejected"].append(delta)
+    
+    del search_memory["tried"][:-SEARCH_MEMORY_SIZE]
+    del search_memory["rejected"][:-SEARCH_MEMORY_SIZE]
+
+
+def _build_refine_prompt(
+    goal: str,
+    iteration: int,
+    count: int,
+    memory_json: str,
+    filters_json: str
+) -> str:
+    """Fill in the per-iteration prompt block"""
+    return _REFINE_PROMPT_DYNAMIC.substitute(
+        goal=goal,
+        iteration=iteration,
+        count=f"{count:,}",
+        memory_json=memory_json,
+        filters_json=filters_json
+    )
+
+
+def _refinement_request(
     filters: dict,
     count: int,
     goal: str,
     iteration: int,
-    previous_counts: list
+    search_memory: dict
 ) -> dict:
-    """Get AI suggestions for refining the search"""
-    
-    client = Anthropic(api_key=ANTHROPIC_API_KEY)
+    """Build the Messages API params for one refinement step"""
     
-    history = "\n".join([
-        f"Iteration {i+1}: {c:,} leads"
-        for i, c in enumerate(previous_counts)
-    ])
+    # Compact JSON: the model doesn't need indentation, and it's fewer tokens
+    dynamic_prompt = _build_refine_prompt(
+        goal,
+        iteration,
+        count,
+        canonical_json(search_memory).decode(),
+        canonical_json(filters).decode()
+    )
     
-    prompt = f"""You're helping refine a lead search in Instantly.ai SuperSearch.
+    return {
+        "model": "claude-sonnet-4-20250514",
+        "max_tokens": 600,  # replies are a short JSON object
+        "system": JSON_ONLY_SYSTEM,
+        "stop_sequences": JSON_STOP_SEQUENCES,
+        "messages": [{
+            "role": "user",
+            "content": [
+                {
+                    "type": "text",
+                    "text": _REFINE_PROMPT_STATIC,
+                    "cache_control": {"type": "ephemeral"}
+                },
+                {"type": "text", "text": dynamic_prompt}
+            ]
+        }]
+    }
 
-GOAL: {goal}
 
-TARGET RANGE: 500-2,000 leads (optimal for manageable enrichment)
+def get_ai_refinement_suggestions(
+    filters: dict,
+    count: int,
+    goal: str,
+    iteration: int,
+    search_memory: dict
+) -> dict:
+    """Get AI suggestions for refining the search"""
+    
+    return stream_json(
+        _get_anthropic(),
+        **_refinement_request(filters, count, goal, iteration, search_memory)
+    )
 
-CURRENT STATUS:
-• Iteration: {iteration}
-• Current Count: {count:,} leads
-• Previous Counts:
-{history}
 
-CURRENT FILTERS:
-{json.dumps(filters, indent=2)}
-
-AVAILABLE ADJUSTMENTS:
-1. Company size (min/max employees)
-2. Industries (add/remove)
-3. Job titles (add/remove/exclude)
-4. Revenue range
-5. Technologies used
-6. Keywords (hiring, funded, growing, etc.)
-7. Funding stage
-8. Geographic specificity (add cities, exclude areas)
+def seed_variants(base_filters: dict) -> list:
+    """The base filters narrowed to each of the SEED_COMPANY_SIZES buckets"""
+    return [{**base_filters, "company_size": size} for size in SEED_COMPANY_SIZES]
 
-ANALYSIS NEEDED:
-1. Is {count:,} leads in the optimal range (500-2,000)?
-2. If not, what's the most impactful filter adjustment?
-3. Are we converging on the right target or should we pivot?
 
-Respond ONLY with valid JSON:
-{{
-  "status": "optimal|too_many|too_few",
-  "recommendation": "proceed|refine|pivot",
-  "reasoning": "one sentence explanation",
-  "suggested_changes": [
-    {{
-      "filter": "company_size",
-      "action": "set",
-      "value": {{"min": 20, "max": 150}},
-      "rationale": "why this helps"
-    }}
-  ],
-  "estimated_impact": "how this will affect lead count",
-  "confidence": "high|medium|low"
-}}"""
-
-    message = client.messages.create(
+def pick_seed(goal: str, base_filters: dict, seeds: list, counts: list) -> tuple:
+    """
+    Choose the starting filters from previewed seed variants.
+    
+    A seed already in the target range is taken directly (closest to the
+    middle of the range wins). Otherwise Claude picks one and adjusts it in
+    a single call. Returns ``(filters, reason)``; raises ValueError if the
+    AI picks a seed number that doesn't exist.
+    """
+    in_range = [
+        (abs(count - (TARGET_MIN + TARGET_MAX) / 2), i)
+        for i, count in enumerate(counts)
+        if count is not None and TARGET_MIN <= count <= TARGET_MAX
+    ]
+    if in_range:
+        return seeds[min(in_range)[1]], "already in the target range"
+    
+    variants = "\n".join(
+        f"{i}. company_size {canonical_json(seed['company_size']).decode()}: "
+        + (f"{count:,} leads" if count is not None else "preview failed")
+        for i, (seed, count) in enumerate(zip(seeds, counts), 1)
+    )
+    dynamic_prompt = _SEED_PROMPT_DYNAMIC.substitute(
+        goal=goal,
+        filters_json=canonical_json(base_filters).decode(),
+        variants=variants
+    )
+    
+    choice = stream_json(
+        _get_anthropic(),
         model="claude-sonnet-4-20250514",
-        max_tokens=2000,
-        messages=[{"role": "user", "content": prompt}]
+        max_tokens=600,
+        messages=[{
+            "role": "user",
+            "content": [
+                {
+                    "type": "text",
+                    "text": _SEED_PROMPT_STATIC,
+                    "cache_control": {"type": "ephemeral"}
+                },
+                {"type": "text", "text": dynamic_prompt}
+            ]
+        }]
     )
     
-    response_text = message.content[0].text
+    seed = int(choice["seed"])
+    if not 1 <= seed <= len(seeds):
+        raise ValueError(f"AI chose seed {seed}, expected 1-{len(seeds)}")
+    
+    filters = seeds[seed - 1]
+    for change in choice.get("suggested_changes", []):
+        filters = apply_filter_change(filters, change)
+    
+    return filters, choice.get("reasoning", "chosen by AI")
+
+
+def batch_refine(goals: list, filters: dict = INITIAL_FILTERS) -> dict:
+    """
+    Get first-round refinement suggestions for many goals at once.
+    
+    Uses the Message Batches API (half the cost of individual calls, but
+    results can take minutes), so it's meant for offline bulk runs rather
+    than the interactive loop in main().
     
-    # Extract JSON from response
-    if "```json" in response_text:
-        json_start = response_text.find("```json") + 7
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
+    Returns a dict mapping each goal to its parsed suggestions, or to None
+    if that request failed.
+    """
+    client = _get_anthropic()
+    
+    count = preview_search(filters).get("count", 0)
+    memory = new_search_memory()
+    record_count(memory, 1, count)
     
-    return json.loads(response_text)
+    batch = client.messages.batches.create(requests=[
+        {
+            "custom_id": f"goal-{i}",
+            "params": _refinement_request(filters, count, goal, 1, memory)
+        }
+        for i, goal in enumerate(goals)
+    ])
+    
+    while batch.processing_status != "ended":
+        time.sleep(BATCH_POLL_SECONDS)
+        batch = client.messages.batches.retrieve(batch.id)
+    
+    results = {goal: None for goal in goals}
+    for entry in client.messages.batches.results(batch.id):
+        goal = goals[int(entry.custom_id.split("-")[1])]
+        if entry.result.type != "succeeded":
+            continue
+        try:
+            results[goal] = parse_json_object(entry.result.message.content[0].text)
+        except json.JSONDecodeError:
+            pass
+    
+    return results
 
 
 def apply_filter_change(filters: dict, change: dict) -> dict:
-    """Apply a suggested filter change"""
-    new_filters = filters.copy()
+    """
+    Apply a suggested filter change.
+    
+    Returns a new dict and never mutates ``filters``: only the branch being
+    changed is rebuilt, the rest is shared with the input.
+    Raises ValueError if an "add" value doesn't fit the existing filter.
+    """
+    new_filters = dict(filters)
     
     filter_name = change["filter"]
     action = change["action"]
-    value = change["value"]
+    value = change.get("value")
     
     if action == "set":
         new_filters[filter_name] = value
     elif action == "add":
-        if filter_name not in new_filters:
-            new_filters[filter_name] = {}
-        if isinstance(value, dict):
-            new_filters[filter_name].update(value)
-        elif isinstance(value, list):
-            if filter_name not in new_filters:
-                new_filters[filter_name] = []
-            new_filters[filter_name].extend(value)
+        existing = filters.get(filter_name)
+        if isinstance(value, dict) and isinstance(existing, (dict, type(None))):
+            new_filters[filter_name] = {**(existing or {}), **value}
+        elif isinstance(value, list) and isinstance(existing, (list, type(None))):
+            new_filters[filter_name] = [*(existing or []), *value]
+        elif isinstance(value, list) and isinstance(existing, dict):
+            # include/exclude filters (job_titles, locations): adding means including
+            new_filters[filter_name] = {
+                **existing,
+                "include": [*existing.get("include", []), *value]
+            }
+        else:
+            raise ValueError(
+                f"Can't add {type(value).__name__} value to {filter_name} "
+                f"({type(existing).__name__})"
+            )
     elif action == "remove":
-        if filter_name in new_filters:
-            del new_filters[filter_name]
+        new_filters.pop(filter_name, None)
     
     return new_filters
 
@@ -167,22 +522,42 @@ def main():
     
     print(f"\nGOAL: {goal.strip()}")
     
-    # Starting filters - deliberately broad
-    current_filters = {
-        "locations": {
-            "include": [{"country": "US", "state": "CO"}],
-            "exclude": []
-        },
-        "job_titles": {
-            "include": ["CEO", "Chief Executive Officer", "Founder", "Co-Founder"],
-            "exclude": ["Assistant", "Associate"]
-        },
-        "management_levels": ["c_level"]
-    }
+    base_filters = copy.deepcopy(INITIAL_FILTERS)
     
     previous_counts = []
+    search_memory = new_search_memory()
+    pending_preview = None
     iteration = 1
     
+    # Preview a few starting points at once; often one is already in range
+    # and the iterative loop below finishes on its first pass
+    print("\n" + "=" * 80)
+    print("PREVIEWING STARTING POINTS")
+    print("=" * 80)
+    
+    seeds = seed_variants(base_filters)
+    seed_counts = list(_PREVIEW_POOL.map(_preview_count, seeds))
+    
+    for size, seed_count in zip(SEED_COMPANY_SIZES, seed_counts):
+        result = f"{seed_count:,} leads" if seed_count is not None else "preview failed"
+        print(f"  • {size['min']:,}-{size['max']:,} employees: {result}")
+    
+    record_changes(
+        search_memory,
+        0,
+        [{"filter": "company_size", "action": "set", "value": size} for size in SEED_COMPANY_SIZES],
+        None,
+        seed_counts,
+        "seed"
+    )
+    
+    try:
+        current_filters, reason = pick_seed(goal, base_filters, seeds, seed_counts)
+        print(f"\n✓ Starting point chosen: {reason}")
+    except Exception as e:
+        print(f"\n⚠️  Could not pick a starting point ({e}) - starting broad")
+        current_filters = base_filters
+    
     print("\n" + "=" * 80)
     print("STARTING ITERATIVE REFINEMENT")
     print("=" * 80)
@@ -193,16 +568,28 @@ def main():
         print(f"{'─' * 80}")
         
         # Preview current filters
-        print("\nCurrent filters:")
-        print(json.dumps(current_filters, indent=2))
+        log.debug("\nCurrent filters:\n%s", _LazyJSON(current_filters))
         
         print("\nPreviewing search...")
-        preview = preview_search(current_filters)
+        if pending_preview is not None:
+            preview = pending_preview.result()
+            pending_preview = None
+        else:
+            preview = preview_search(current_filters)
         count = preview.get("count", 0)
         previous_counts.append(count)
+        record_count(search_memory, iteration, count)
         
         print(f"\n📊 Results: {count:,} leads found")
         
+        # An in-range count that has stopped moving needs no AI opinion
+        if TARGET_MIN <= count <= TARGET_MAX and (
+            len(previous_counts) < 2
+            or abs(count - previous_counts[-2]) / max(previous_counts[-2], 1) < STABLE_COUNT_CHANGE
+        ):
+            print("\n✅ Count in optimal range — skipping AI call")
+            break
+        
         # Get AI analysis
         print("\n🤖 Getting AI analysis...")
         try:
@@ -211,8 +598,9 @@ def main():
                 count,
                 goal,
                 iteration,
-                previous_counts
+                search_memory
             )
+            log.debug("\nRaw suggestions:\n%s", _LazyJSON(suggestions))
             
             print(f"\nStatus: {suggestions['status'].upper()}")
             print(f"Recommendation: {suggestions['recommendation'].upper()}")
@@ -238,20 +626,48 @@ def main():
             
             # Apply suggested changes
             if suggestions.get('suggested_changes'):
-                print(f"\nSuggested Changes ({len(suggestions['suggested_changes'])}):")
-                for i, change in enumerate(suggestions['suggested_changes'], 1):
+                changes = suggestions['suggested_changes']
+                
+                # Start previewing the proposed filters while the user
+                # decides, so accepting doesn't wait on another round-trip
+                proposed_filters = current_filters
+                for change in changes:
+                    proposed_filters = apply_filter_change(proposed_filters, change)
+                speculative_preview = _PREVIEW_POOL.submit(preview_search, proposed_filters)
+                
+                # Preview each change on its own in parallel so every
+                # rationale can be shown next to the count it would produce
+                # (a single change is the proposal itself, so reuse that preview)
+                if len(changes) == 1:
+                    try:
+                        candidate_counts = [speculative_preview.result().get("count", 0)]
+                    except requests.RequestException:
+                        candidate_counts = [None]
+                else:
+                    candidate_filters = [
+                        apply_filter_change(current_filters, change)
+                        for change in changes
+                    ]
+                    candidate_counts = list(_PREVIEW_POOL.map(_preview_count, candidate_filters))
+                
+                print(f"\nSuggested Changes ({len(changes)}):")
+                for i, (change, candidate_count) in enumerate(zip(changes, candidate_counts), 1):
                     print(f"\n{i}. Filter: {change['filter']}")
                     print(f"   Action: {change['action']}")
                     print(f"   Value: {change.get('value')}")
                     print(f"   Rationale: {change['rationale']}")
+                    if candidate_count is not None:
+                        print(f"   Leads if applied alone: {candidate_count:,}")
                 
                 # Ask user to confirm
                 apply = input("\nApply these changes? (y/n): ")
                 if apply.lower() == 'y':
-                    for change in suggestions['suggested_changes']:
-                        current_filters = apply_filter_change(current_filters, change)
+                    current_filters = proposed_filters
+                    pending_preview = speculative_preview
+                    record_changes(search_memory, iteration, changes, count, candidate_counts, "applied")
                     print("✓ Changes applied")
                 else:
+                    record_changes(search_memory, iteration, changes, count, candidate_counts, "rejected")
                     print("✗ Changes not applied")
                     manual = input("Enter your own filter adjustments? (y/n): ")
                     if manual.lower() != 'y':
@@ -261,10 +677,10 @@ def main():
             print(f"\n❌ Error getting AI suggestions: {e}")
             print("Falling back to manual refinement")
             
-            if count > 2000:
+            if count > TARGET_MAX:
                 print("\nSuggestion: Add more filters to narrow results")
                 print("Options: company_size, industries, revenue_range")
-            elif count < 500:
+            elif count < TARGET_MIN:
                 print("\nSuggestion: Broaden filters or expand geography")
                 print("Options: Add more job titles, expand to nearby states")
             else:
@@ -303,13 +719,9 @@ def main():
     if proceed in ['yes', 'y']:
         print("\n⏳ Starting enrichment...")
         
-        response = requests.post(
+        response = _SESSION.post(
             f"{BASE_URL}/supersearch-enrichment/enrich-leads-from-supersearch",
-            headers={
-                "Authorization": f"Bearer {INSTANTLY_API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
+            data=orjson.dumps({
                 "search_filters": current_filters,
                 "limit": min(count, 1000),
                 "list_name": f"CO CEOs - Refined {count} leads",
@@ -319,7 +731,7 @@ def main():
                     "fully_enriched_profile": True,
                     "custom_flow": ["instantly"]
                 }
-            }
+            })
         )
         
         if response.status_code == 200:
@@ -337,6 +749,30 @@ def main():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--batch",
+        metavar="GOALS_FILE",
+        help="Refine many goals (one per line) via the Message Batches API "
+             "instead of running the interactive loop"
+    )
+    parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Show the full filters and AI responses on every iteration"
+    )
+    parser.add_argument(
+        "--check-prompt-cache",
+        action="store_true",
+        help="Count the static prompt's tokens, report whether it is long "
+             "enough to be cached, and exit"
+    )
+    args = parser.parse_args()
+    
+    # Only this script's logger goes to DEBUG, not requests/anthropic internals
+    logging.basicConfig(format="%(message)s")
+    log.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    
     if INSTANTLY_API_KEY == "your_instantly_api_key_here":
         print("❌ Please set your INSTANTLY_API_KEY in the script")
         exit(1)
@@ -345,4 +781,26 @@ if __name__ == "__main__":
         print("❌ Please set your ANTHROPIC_API_KEY for AI-powered refinement")
         exit(1)
     
-    main()
+    if args.check_prompt_cache:
+        try:
+            check_prompt_budget()
+        except APIError as e:
+            print(f"⚠️  Could not count prompt tokens: {e}")
+    elif args.batch:
+        with open(args.batch) as f:
+            goals = [line.strip() for line in f if line.strip()]
+        
+        print(f"Submitting {len(goals)} goals as a message batch...")
+        for goal, suggestions in batch_refine(goals).items():
+            print(f"\n{'─' * 80}")
+            print(f"GOAL: {goal}")
+            if suggestions is None:
+                print("❌ No valid response for this goal")
+                continue
+            print(f"Status: {suggestions['status'].upper()}")
+            print(f"Recommendation: {suggestions['recommendation'].upper()}")
+            print(f"Reasoning: {suggestions['reasoning']}")
+            for change in suggestions.get('suggested_changes', []):
+                print(f"  • {change['action']} {change['filter']}: {change.get('value')}")
+    else:
+        main()
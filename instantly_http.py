@@ -0,0 +1,66 @@
+"""
+HTTP session setup shared by the Instantly.ai scripts
+
+advanced_refinement.py and instantly_workflow.py both talk to the same API
+with the same retry rules, so the session is configured once here.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+INSTANTLY_BASE_URL = "https://api.instantly.ai/api/v2"
+
+
+def make_instantly_session(api_key: str, base_url: str = INSTANTLY_BASE_URL) -> requests.Session:
+    """
+    Create an authenticated session for the Instantly.ai API
+    
+    The session keeps connections alive between calls and retries transient
+    failures with exponential backoff, honoring Retry-After.
+    
+    Args:
+        api_key: Your Instantly.ai API key
+        base_url: API root the enrichment endpoint is mounted under
+    
+    Returns:
+        A configured requests.Session
+    """
+    session = requests.Session()
+    session.headers.update({
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    })
+    
+    # Transient 429/5xx responses are retried so one hiccup doesn't throw
+    # away the caller's workflow
+    session.mount("https://", HTTPAdapter(
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        ),
+        pool_connections=4,
+        pool_maxsize=16
+    ))
+    
+    # Enrichment spends credits, so only retry it when the API refused it
+    # outright (429); after a 5xx or dropped response a job may have started
+    session.mount(
+        f"{base_url}/supersearch-enrichment/enrich-leads-from-supersearch",
+        HTTPAdapter(max_retries=Retry(
+            total=5,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=(429,),
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        ))
+    )
+    
+    return session
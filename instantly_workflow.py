@@ -10,11 +10,16 @@ Author: Claude
 Date: January 2026
 """
 
-import requests
 import json
+import time
+import orjson
+from string import Template
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 import anthropic
+from instantly_http import make_instantly_session
+from prompts import FILTER_SCHEMA_BLOCK, canonical_json, stream_json
 
 
 @dataclass
@@ -29,6 +34,7 @@ class InstantlyAIClient:
     """Client for interacting with Instantly.ai API"""
     
     BASE_URL = "https://api.instantly.ai/api/v2"
+    PREVIEW_CACHE_SIZE = 128
     
     def __init__(self, api_key: str):
         """
@@ -42,11 +48,24 @@ class InstantlyAIClient:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        
+        # One keep-alive connection pool with retries for every call to the API
+        self.session = make_instantly_session(api_key, self.BASE_URL)
+        
+        # Previews keyed on canonical filter JSON, so re-previewing an
+        # unchanged filter set doesn't cost another round-trip
+        self._preview_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        
+        # Last ETag and body seen per enrichment resource, so repeated status
+        # polls can be answered with a bodyless 304 when nothing changed
+        self._etags: Dict[str, str] = {}
+        self._status_cache: Dict[str, Dict[str, Any]] = {}
     
     def preview_leads(self, search_filters: Dict[str, Any]) -> SearchResult:
         """
         Preview leads from a SuperSearch without actually enriching them.
         This is useful to check lead counts before committing credits.
+        Identical filter sets are served from an in-memory cache.
         
         Args:
             search_filters: Dictionary of search filters
@@ -54,16 +73,26 @@ class InstantlyAIClient:
         Returns:
             SearchResult object with count and filters
         """
-        url = f"{self.BASE_URL}/supersearch-enrichment/preview-leads-from-supersearch"
+        key = canonical_json(search_filters)
         
-        payload = {
-            "search_filters": search_filters
-        }
-        
-        response = requests.post(url, headers=self.headers, json=payload)
-        response.raise_for_status()
-        
-        data = response.json()
+        if key in self._preview_cache:
+            self._preview_cache.move_to_end(key)
+            data = self._preview_cache[key]
+        else:
+            url = f"{self.BASE_URL}/supersearch-enrichment/preview-leads-from-supersearch"
+            
+            payload = {
+                "search_filters": search_filters
+            }
+            
+            response = self.session.post(url, data=orjson.dumps(payload))
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            self._preview_cache[key] = data
+            if len(self._preview_cache) > self.PREVIEW_CACHE_SIZE:
+                self._preview_cache.popitem(last=False)
         
         return SearchResult(
             count=data.get("count", 0),
@@ -109,7 +138,7 @@ class InstantlyAIClient:
         if enrichment_options:
             payload["enrichment_payload"] = enrichment_options
         
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = self.session.post(url, data=orjson.dumps(payload))
         response.raise_for_status()
         
         return response.json()
@@ -126,15 +155,125 @@ class InstantlyAIClient:
         """
         url = f"{self.BASE_URL}/supersearch-enrichment/{resource_id}"
         
-        response = requests.get(url, headers=self.headers)
+        headers = {}
+        if resource_id in self._etags:
+            headers["If-None-Match"] = self._etags[resource_id]
+        
+        response = self.session.get(url, headers=headers)
+        if response.status_code == 304:
+            return self._status_cache[resource_id]
         response.raise_for_status()
         
-        return response.json()
+        data = response.json()
+        
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etags[resource_id] = etag
+            self._status_cache[resource_id] = data
+        
+        return data
+    
+    def wait_for_enrichment(
+        self,
+        resource_id: str,
+        timeout: float = 3600,
+        initial_delay: float = 2.0,
+        max_delay: float = 30.0
+    ) -> Dict[str, Any]:
+        """
+        Poll an enrichment job until it is no longer in progress
+        
+        The delay between polls grows exponentially up to max_delay.
+        
+        Args:
+            resource_id: ID of the list/campaign being enriched
+            timeout: Maximum number of seconds to wait
+            initial_delay: Seconds to wait before the second poll
+            max_delay: Upper bound on the delay between polls
+            
+        Returns:
+            Dictionary with the final enrichment status details
+            
+        Raises:
+            TimeoutError: If the job is still running after timeout seconds
+        """
+        deadline = time.monotonic() + timeout
+        delay = initial_delay
+        
+        while True:
+            status = self.get_enrichment_status(resource_id)
+            if not status.get("in_progress"):
+                return status
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"Enrichment {resource_id} still in progress after {timeout:g}s"
+                )
+            
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 1.7, max_delay)
+
+
+# Prompt instructions are kept as module constants so the cached prefix is
+# byte-identical on every call; only the small templates below vary
+_ANALYZE_PROMPT_STATIC = f"""I'm using Instantly.ai's SuperSearch to find leads.
+
+Please analyze the search results below and provide:
+1. Assessment: Is the lead count appropriate? (Too few? Too many? Just right?)
+2. Filter Quality: Are the current filters well-targeted for the goal?
+3. Refinements: Suggest specific improvements to the search filters
+4. Next Steps: Should I proceed with enrichment or refine further?
+
+Available filter types in Instantly.ai:
+{FILTER_SCHEMA_BLOCK}
+
+Provide your response as structured JSON with:
+- assessment: string
+- suggestions: array of specific filter changes
+- proceed_with_enrichment: boolean
+- reasoning: string
+"""
+
+_ANALYZE_PROMPT = Template("""Here's my situation:
+
+GOAL: $goal
+
+CURRENT SEARCH FILTERS:
+$filters
+
+RESULTS: Found $count leads
+
+ITERATION: #$iteration
+""")
+
+_SUGGEST_FILTERS_PROMPT_STATIC = f"""Convert the natural language lead description below into Instantly.ai search filters.
+
+Available filter types:
+{FILTER_SCHEMA_BLOCK}
+
+Provide a JSON object with appropriate filters for this search. Only include filters that are clearly relevant.
+"""
+
+_SUGGEST_FILTERS_PROMPT = Template('"$description"')
+
+
+def _build_analyze_prompt(goal: str, filters_json: str, count: int, iteration: int) -> str:
+    """Fill in the per-call analysis prompt block"""
+    return _ANALYZE_PROMPT.substitute(
+        goal=goal,
+        filters=filters_json,
+        count=f"{count:,}",
+        iteration=iteration
+    )
 
 
 class SearchRefiner:
     """Uses an LLM to help refine and improve search filters"""
     
+    # Lead counts in this range are good to enrich without asking the LLM
+    TARGET_RANGE = (500, 2000)
+    
     def __init__(self, anthropic_api_key: Optional[str] = None):
         """
         Initialize the search refiner with optional Anthropic API key
@@ -161,66 +300,44 @@ class SearchRefiner:
         Returns:
             Dictionary with analysis and suggested refinements
         """
+        target_min, target_max = self.TARGET_RANGE
+        if target_min <= search_result.count <= target_max:
+            return {
+                "assessment": f"{search_result.count:,} leads is within the "
+                              f"{target_min:,}-{target_max:,} target range",
+                "suggestions": [],
+                "proceed_with_enrichment": True,
+                "reasoning": "Lead count already in the optimal range - no refinement needed"
+            }
+        
         if not self.client:
             print("No Anthropic API key provided - returning manual refinement prompt")
             return self._manual_refinement_prompt(search_result, goal_description)
         
-        prompt = f"""I'm using Instantly.ai's SuperSearch to find leads. Here's my situation:
-
-GOAL: {goal_description}
-
-CURRENT SEARCH FILTERS:
-{json.dumps(search_result.search_filters, indent=2)}
-
-RESULTS: Found {search_result.count:,} leads
-
-ITERATION: #{current_iteration}
-
-Please analyze these results and provide:
-1. Assessment: Is the lead count appropriate? (Too few? Too many? Just right?)
-2. Filter Quality: Are the current filters well-targeted for the goal?
-3. Refinements: Suggest specific improvements to the search filters
-4. Next Steps: Should I proceed with enrichment or refine further?
-
-Available filter types in Instantly.ai:
-- locations (include/exclude with city, state, country)
-- job_titles (include/exclude)
-- departments (e.g., "executive", "sales", "marketing")
-- management_levels (e.g., "c_level", "vp", "director")
-- industries
-- company_size (min/max employee count)
-- revenue_range (min/max)
-- technologies (software/tools used)
-- keywords (in job descriptions or company info)
-- funding_type, funding_stage
-
-Provide your response as structured JSON with:
-- assessment: string
-- suggestions: array of specific filter changes
-- proceed_with_enrichment: boolean
-- reasoning: string
-"""
+        dynamic_prompt = _build_analyze_prompt(
+            goal_description,
+            canonical_json(search_result.search_filters).decode(),
+            search_result.count,
+            current_iteration
+        )
         
         try:
-            message = self.client.messages.create(
+            analysis = stream_json(
+                self.client,
                 model="claude-sonnet-4-20250514",
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}]
+                max_tokens=600,
+                messages=[{
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": _ANALYZE_PROMPT_STATIC,
+                            "cache_control": {"type": "ephemeral"}
+                        },
+                        {"type": "text", "text": dynamic_prompt}
+                    ]
+                }]
             )
-            
-            response_text = message.content[0].text
-            
-            # Try to extract JSON if it's wrapped in markdown
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            
-            analysis = json.loads(response_text)
             return analysis
             
         except Exception as e:
@@ -258,44 +375,26 @@ Provide your response as structured JSON with:
             print("No Anthropic API key - please create filters manually")
             return {}
         
-        prompt = f"""Convert this natural language lead description into Instantly.ai search filters:
-
-"{description}"
-
-Available filter types:
-- locations: {{include: [{{"country": "US", "state": "CO"}}], exclude: []}}
-- job_titles: {{include: ["CEO", "Chief Executive Officer"], exclude: []}}
-- departments: ["executive", "sales", "marketing", "engineering", "operations"]
-- management_levels: ["c_level", "vp", "director", "manager"]
-- industries: ["Technology", "SaaS", "Healthcare", etc.]
-- company_size: {{min: 10, max: 500}}
-- revenue_range: {{min: 1000000, max: 50000000}}
-- technologies: ["Salesforce", "HubSpot", etc.]
-- keywords: ["hiring", "recently funded", etc.]
-
-Provide a JSON object with appropriate filters for this search. Only include filters that are clearly relevant.
-"""
-        
         try:
-            message = self.client.messages.create(
+            filters = stream_json(
+                self.client,
                 model="claude-sonnet-4-20250514",
-                max_tokens=1500,
-                messages=[{"role": "user", "content": prompt}]
+                max_tokens=800,
+                messages=[{
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": _SUGGEST_FILTERS_PROMPT_STATIC,
+                            "cache_control": {"type": "ephemeral"}
+                        },
+                        {
+                            "type": "text",
+                            "text": _SUGGEST_FILTERS_PROMPT.substitute(description=description)
+                        }
+                    ]
+                }]
             )
-            
-            response_text = message.content[0].text
-            
-            # Extract JSON
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            
-            filters = json.loads(response_text)
             return filters
             
         except Exception as e:
@@ -503,6 +602,6 @@ if __name__ == "__main__":
     
     print(__doc__)
     print("\nTo use this script:")
-    print("1. Install dependencies: pip install requests anthropic")
+    print("1. Install dependencies: pip install requests anthropic orjson")
     print("2. Set your API keys in the script")
     print("3. Uncomment and run run_workflow_example() or quick_example()")
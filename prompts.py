@@ -0,0 +1,63 @@
+"""
+Prompt text and JSON helpers shared by the Instantly.ai refinement scripts
+
+Both advanced_refinement.py and instantly_workflow.py describe the same
+SuperSearch filter taxonomy to Claude. Keeping one copy here keeps every
+prompt consistent, so a filter added or renamed here reaches all of them.
+"""
+
+import json
+
+import orjson
+
+
+# Keeps replies to a bare JSON object so they can be parsed as they stream
+JSON_ONLY_SYSTEM = "Respond with a single JSON object only, no markdown fences, no prose."
+JSON_STOP_SEQUENCES = ["\n```", "</json>"]
+
+# Filter types accepted by the SuperSearch endpoints, with example values
+FILTER_SCHEMA_BLOCK = """\
+- locations: {include: [{"country": "US", "state": "CO", "city": "Denver"}], exclude: []}
+- job_titles: {include: ["CEO", "Chief Executive Officer"], exclude: ["Assistant"]}
+- departments: ["executive", "sales", "marketing", "engineering", "operations"]
+- management_levels: ["c_level", "vp", "director", "manager"]
+- industries: ["Technology", "SaaS", "Healthcare", etc.]
+- company_size: {min: 10, max: 500} (employee count)
+- revenue_range: {min: 1000000, max: 50000000}
+- technologies: ["Salesforce", "HubSpot", etc.] (software/tools used)
+- keywords: ["hiring", "recently funded", etc.]
+- funding_type: ["seed", "series_a", "series_b"]
+- funding_stage: ["funded"]"""
+
+
+def canonical_json(data) -> bytes:
+    """Canonical (sorted-key, compact) JSON bytes, used as a cache key"""
+    return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+
+
+def parse_json_object(text: str) -> dict:
+    """Decode the first JSON object in ``text``, ignoring anything around it"""
+    start = text.find("{")
+    return json.JSONDecoder().raw_decode(text, max(start, 0))[0]
+
+
+def stream_json(client, **params) -> dict:
+    """
+    Stream a Claude response and return its JSON object as soon as it closes,
+    without waiting for (or paying for) anything generated after it.
+    ``system`` and ``stop_sequences`` default to the JSON-only settings above.
+    """
+    params.setdefault("system", JSON_ONLY_SYSTEM)
+    params.setdefault("stop_sequences", JSON_STOP_SEQUENCES)
+    
+    text = ""
+    with client.messages.stream(**params) as stream:
+        for chunk in stream.text_stream:
+            text += chunk
+            if "}" in chunk:
+                try:
+                    return parse_json_object(text)
+                except json.JSONDecodeError:
+                    pass
+    
+    return parse_json_object(text)
@@ -9,11 +9,22 @@ This script demonstrates the complete workflow:
 
 Usage:
     python simple_example.py
+    python simple_example.py --yes --max-cost 5   # unattended, capped at $5
 """
 
-import requests
-import json
-import anthropic
+import argparse
+import asyncio
+import hashlib
+import importlib.util
+import random
+import socket
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+import httpx
+import orjson
 
 
 # ============================================================================
@@ -24,255 +35,558 @@ ANTHROPIC_API_KEY = "your_anthropic_api_key_here"  # Optional but recommended
 
 BASE_URL = "https://api.instantly.ai/api/v2"
 
+# HTTP/2 multiplexes every call over one connection; needs the h2 package
+# (pip install "httpx[http2,brotli]"), otherwise httpx stays on HTTP/1.1.
+# The brotli extra needs no code: httpx advertises and decodes br responses
+# whenever the package is installed, falling back to gzip otherwise.
+HTTP2 = importlib.util.find_spec("h2") is not None
 
-# ============================================================================
-# STEP 1: Define Your Search
-# ============================================================================
+# Transient statuses worth retrying. Enrichment spends credits, so it is only
+# retried on 429, where the request was rejected before any work started.
+RETRY_STATUSES = (429, 502, 503, 504)
+ENRICH_RETRY_STATUSES = (429,)
+MAX_ATTEMPTS = 5
+MAX_RETRY_DELAY = 30  # seconds; also caps a server's Retry-After
 
-print("=" * 70)
-print("STEP 1: DEFINING SEARCH FOR CEOS IN COLORADO")
-print("=" * 70)
-
-# Basic search filters
-search_filters = {
-    "locations": {
-        "include": [
-            {"country": "US", "state": "CO"}
-        ],
-        "exclude": []
-    },
-    "job_titles": {
-        "include": [
-            "CEO",
-            "Chief Executive Officer",
-            "Founder",
-            "Co-Founder",
-            "President"
-        ],
-        "exclude": [
-            "Assistant to the CEO",
-            "Executive Assistant"
-        ]
-    },
-    "management_levels": ["c_level"],
-    "company_size": {
-        "min": 10,
-        "max": 500
-    }
-}
+# Most enrichment jobs enrich_many() starts at once; stays below the client's
+# connection limit so queued jobs wait on the semaphore, not the pool
+ENRICH_CONCURRENCY = 5
 
-print("\nSearch Filters:")
-print(json.dumps(search_filters, indent=2))
+# Preview counts are cached on disk so re-running with unchanged filters is free
+PREVIEW_CACHE_DIR = Path.home() / ".cache" / "instantly-preview"
+PREVIEW_CACHE_TTL = 600  # seconds
 
 
-# ============================================================================
-# STEP 2: Preview Search Results (FREE - No Credits Used)
-# ============================================================================
+@dataclass(frozen=True, slots=True)
+class Pricing:
+    """Enrichment rates used for the cost estimate."""
+    credits_per_lead: float = 1.5  # work email + verification
+    usd_per_credit: float = 9 / 2000  # $9 per 2000 credits
+
+    def estimate(self, leads):
+        """Return (credits, usd) for enriching this many leads."""
+        credits = leads * self.credits_per_lead
+        return credits, credits * self.usd_per_credit
+
+
+PRICING = Pricing()
+
+DEFAULT_ENRICHMENT_PAYLOAD = {
+    "work_email_enrichment": True,
+    "email_verification": True,
+    "fully_enriched_profile": True,
+    "custom_flow": ["instantly"]  # Use Instantly's waterfall enrichment
+}
+
+# Fixed instructions go in the system prompt so only the search itself varies.
+# The analysis runs while the preview is still in flight, so it judges the
+# filters alone; the count and cost are reported by the script.
+ANALYSIS_SYSTEM = """You review lead search filters for an Instantly.ai enrichment.
+The lead count is not known yet. Give a brief, actionable analysis:
+1. Are these filters likely too broad, too narrow, or about right for the goal?
+2. Is anything missing, redundant, or likely to exclude good leads?
+3. Suggest 2-3 specific filter adjustments, if any"""
 
-print("\n" + "=" * 70)
-print("STEP 2: PREVIEWING SEARCH RESULTS (No cost)")
-print("=" * 70)
+# Output is block-buffered and flushed before each network wait
+BANNER = "=" * 70
 
-headers = {
+HEADERS = {
     "Authorization": f"Bearer {INSTANTLY_API_KEY}",
     "Content-Type": "application/json"
 }
 
-response = requests.post(
-    f"{BASE_URL}/supersearch-enrichment/preview-leads-from-supersearch",
-    headers=headers,
-    json={"search_filters": search_filters}
-)
 
-if response.status_code != 200:
-    print(f"❌ Error: {response.status_code}")
-    print(response.text)
-    exit(1)
+# ============================================================================
+# ERRORS - each failure class exits with its own status code
+# ============================================================================
 
-preview_data = response.json()
-lead_count = preview_data.get("count", 0)
+class InstantlyError(Exception):
+    """Base class for failures that end the run."""
+    exit_code = 1
 
-print(f"\n✓ Found {lead_count:,} leads matching your criteria")
 
+class PreviewFailed(InstantlyError):
+    """The preview request was rejected."""
+    exit_code = 2
+
+    def __init__(self, status_code, body):
+        super().__init__(f"Error: {status_code}\n{body}")
+
+
+class EnrichmentFailed(InstantlyError):
+    """The enrichment request was rejected."""
+    exit_code = 3
+
+    def __init__(self, status_code, body):
+        super().__init__(f"Error starting enrichment: {status_code}\n{body}")
 
-# ============================================================================
-# STEP 3: AI Analysis and Recommendations (Optional)
-# ============================================================================
 
-print("\n" + "=" * 70)
-print("STEP 3: AI ANALYSIS")
-print("=" * 70)
+class NoLeadsFound(InstantlyError):
+    """The filters matched nothing."""
+    exit_code = 4
 
-if ANTHROPIC_API_KEY and ANTHROPIC_API_KEY != "your_anthropic_api_key_here":
+
+class CostLimitExceeded(InstantlyError):
+    """The estimated spend is above --max-cost."""
+    exit_code = 5
+
+
+def _resolve(host):
     try:
-        client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
-        
-        prompt = f"""Analyze this lead search result:
+        socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+    except OSError:
+        pass  # the real request will report the failure
+
 
-Search Goal: Find CEOs at companies in Colorado
-Current Filters: {json.dumps(search_filters, indent=2)}
-Results: {lead_count:,} leads found
+def prewarm_dns():
+    """Resolve the API hosts in the background while the script sets up."""
+    hosts = ["api.instantly.ai"]
+    if ANTHROPIC_API_KEY and ANTHROPIC_API_KEY != "your_anthropic_api_key_here":
+        hosts.append("api.anthropic.com")
+    for host in hosts:
+        threading.Thread(target=_resolve, args=(host,), daemon=True).start()
+
+
+def retry_after(response, default):
+    """Seconds the server asked us to wait, or default if it didn't say."""
+    try:
+        return max(float(response.headers["Retry-After"]), 0.0)
+    except (KeyError, ValueError):
+        return default
 
-Provide a brief analysis:
-1. Is the lead count appropriate? (Too few, too many, or just right?)
-2. What's the estimated cost? (Assume 1.5 credits per lead for email + verification)
-3. Should we proceed or refine the search?
-4. If refining, suggest 2-3 specific filter adjustments
 
-Keep your response concise and actionable."""
+async def request_with_retry(client, method, url, retry_statuses=RETRY_STATUSES, **kwargs):
+    """Send a request, retrying transient statuses with jittered exponential backoff.
+
+    Returns the final response, which is the failed one if every attempt failed.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        response = await client.request(method, url, **kwargs)
+        if response.status_code not in retry_statuses or attempt == MAX_ATTEMPTS - 1:
+            return response
+
+        backoff = min(2 ** attempt, MAX_RETRY_DELAY) * random.uniform(0.5, 1.0)
+        await asyncio.sleep(min(retry_after(response, backoff), MAX_RETRY_DELAY))
+
+
+def _preview_cache_path(search_filters):
+    key = hashlib.sha256(orjson.dumps(search_filters, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return PREVIEW_CACHE_DIR / f"{key}.json"
+
+
+def cached_preview_count(search_filters):
+    """Lead count from a recent preview of the same filters, or None."""
+    try:
+        entry = orjson.loads(_preview_cache_path(search_filters).read_bytes())
+        if time.time() - entry["ts"] < PREVIEW_CACHE_TTL:
+            return entry["count"]
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError):
+        pass
+    return None
+
+
+def cache_preview_count(search_filters, count):
+    """Best-effort write; a read-only home directory just means no caching."""
+    try:
+        PREVIEW_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _preview_cache_path(search_filters).write_bytes(
+            orjson.dumps({"count": count, "ts": time.time()})
+        )
+    except OSError:
+        pass
+
+
+# Both POSTs take the filters as already-serialized JSON bytes and splice them
+# into the body, so the filter dict is encoded once per run
+async def preview(client, filters_json):
+    return await request_with_retry(
+        client, "POST", "/supersearch-enrichment/preview-leads-from-supersearch",
+        content=b'{"search_filters":%b}' % filters_json
+    )
+
+
+async def enrich(client, filters_json, options):
+    return await request_with_retry(
+        client, "POST", "/supersearch-enrichment/enrich-leads-from-supersearch",
+        retry_statuses=ENRICH_RETRY_STATUSES,
+        content=b'{"search_filters":%b,%b' % (filters_json, orjson.dumps(options)[1:])
+    )
+
+
+async def status(client, resource_id):
+    return await request_with_retry(client, "GET", f"/supersearch-enrichment/{resource_id}")
+
+
+async def lists_named(client, list_name):
+    """IDs of existing lead lists called list_name, or None if the lookup failed.
+
+    Purely informational, so it never raises.
+    """
+    try:
+        response = await client.get("/lead-lists", params={"search": list_name, "limit": 100})
+        if response.status_code != 200:
+            return None
+        items = orjson.loads(response.content).get("items", [])
+        return {item.get("id") for item in items if item.get("name") == list_name}
+    except (httpx.HTTPError, orjson.JSONDecodeError, AttributeError):
+        return None
+
+
+async def wait_for_completion(client, resource_id, deadline=600,
+                              initial_delay=2.0, max_delay=30.0):
+    """Poll the enrichment status until it finishes, fails, or the deadline passes.
+
+    Returns the last status response; it may still show in_progress if the
+    deadline ran out first.
+    """
+    start = time.monotonic()
+    delay = initial_delay
+
+    while True:
+        # A job that was just started is always in progress, so wait before
+        # every poll, including the first
+        await asyncio.sleep(delay)
+        response = await status(client, resource_id)
+        if response.status_code != 200 or not orjson.loads(response.content).get("in_progress"):
+            return response
+
+        remaining = deadline - (time.monotonic() - start)
+        if remaining <= 0:
+            return response
+
+        delay = min(delay * 1.5, max_delay, remaining)
+
+
+def _make_client():
+    """AsyncClient for the Instantly API, sharing keep-alive connections across calls.
+
+    The transport retries failed connects, not HTTP error responses.
+    """
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        headers=HEADERS,
+        timeout=30,
+        transport=httpx.AsyncHTTPTransport(
+            http2=HTTP2,
+            retries=3,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        ),
+    )
+
+
+async def enrich_leads(filters, *, client=None, limit=1000, list_name=None,
+                       enrichment_payload=None):
+    """Start an enrichment job and return the API's job details.
+
+    filters may be a dict or its already-serialized JSON bytes. Pass client to
+    reuse one connection pool across many calls; otherwise a client is opened
+    and closed for this call. Raises EnrichmentFailed if the request is rejected.
+    """
+    if client is None:
+        async with _make_client() as client:
+            return await enrich_leads(filters, client=client, limit=limit, list_name=list_name,
+                                      enrichment_payload=enrichment_payload)
+
+    filters_json = filters if isinstance(filters, bytes) else orjson.dumps(filters)
+    options = {
+        "limit": limit,
+        "enrichment_payload": enrichment_payload or DEFAULT_ENRICHMENT_PAYLOAD
+    }
+    if list_name:
+        options["list_name"] = list_name
+
+    response = await enrich(client, filters_json, options)
+    if response.status_code != 200:
+        raise EnrichmentFailed(response.status_code, response.text)
+    return orjson.loads(response.content)
 
-        message = client.messages.create(
+
+async def enrich_many(jobs, *, client=None, concurrency=ENRICH_CONCURRENCY):
+    """Start several enrichment jobs over one client, at most concurrency at a time.
+
+    Each job is a dict of enrich_leads arguments, e.g.
+    {"filters": {...}, "list_name": "Texas CFOs", "limit": 500}.
+    Returns results in job order; a job that failed yields its exception
+    rather than cancelling the others, which may already be spending credits.
+    """
+    if client is None:
+        async with _make_client() as client:
+            return await enrich_many(jobs, client=client, concurrency=concurrency)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def enrich_one(job):
+        async with semaphore:
+            return await enrich_leads(client=client, **job)
+
+    return await asyncio.gather(*(enrich_one(job) for job in jobs), return_exceptions=True)
+
+
+async def stream_analysis(claude, prompt, queue):
+    """Stream Claude's analysis into queue, ending with an exception or None."""
+    try:
+        async with claude.messages.stream(
             model="claude-sonnet-4-20250514",
             max_tokens=1000,
+            system=[{
+                "type": "text",
+                "text": ANALYSIS_SYSTEM,
+                "cache_control": {"type": "ephemeral"}
+            }],
             messages=[{"role": "user", "content": prompt}]
-        )
-        
-        ai_analysis = message.content[0].text
-        print("\n🤖 Claude's Analysis:")
-        print(ai_analysis)
-        
+        ) as stream:
+            async for text in stream.text_stream:
+                queue.put_nowait(text)
     except Exception as e:
-        print(f"\n⚠️  Could not get AI analysis: {e}")
-        print("Proceeding without AI recommendations...")
-else:
-    print("\n⚠️  No Anthropic API key provided - skipping AI analysis")
-    print(f"Manual assessment: {lead_count:,} leads found")
-    
-    if lead_count == 0:
-        print("❌ No leads found - filters may be too restrictive")
-        exit(1)
-    elif lead_count > 10000:
-        print("⚠️  Large result set - consider narrowing filters to save credits")
+        queue.put_nowait(e)
+    queue.put_nowait(None)
+
+
+async def run(client, args):
+    # ============================================================================
+    # STEP 1: Define Your Search
+    # ============================================================================
+
+    print(BANNER)
+    print("STEP 1: DEFINING SEARCH FOR CEOS IN COLORADO")
+    print(BANNER, flush=True)
+
+    # Basic search filters
+    search_filters = {
+        "locations": {
+            "include": [
+                {"country": "US", "state": "CO"}
+            ],
+            "exclude": []
+        },
+        "job_titles": {
+            "include": [
+                "CEO",
+                "Chief Executive Officer",
+                "Founder",
+                "Co-Founder",
+                "President"
+            ],
+            "exclude": [
+                "Assistant to the CEO",
+                "Executive Assistant"
+            ]
+        },
+        "management_levels": ["c_level"],
+        "company_size": {
+            "min": 10,
+            "max": 500
+        }
+    }
+
+    filters_pretty = orjson.dumps(search_filters, option=orjson.OPT_INDENT_2).decode()
+    filters_compact = orjson.dumps(search_filters)
+
+    print("\nSearch Filters:")
+    print(filters_pretty)
+
+    # Start Claude on the filters now so its latency hides behind the preview;
+    # the text is buffered until STEP 3 prints it
+    analysis = None
+    if ANTHROPIC_API_KEY and ANTHROPIC_API_KEY != "your_anthropic_api_key_here":
+        # Imported here so runs without a key skip loading the SDK
+        import anthropic
+
+        claude = anthropic.AsyncAnthropic(
+            api_key=ANTHROPIC_API_KEY, max_retries=MAX_ATTEMPTS - 1
+        )
+        prompt = f"""Search Goal: Find CEOs at companies in Colorado
+Current Filters: {filters_compact.decode()}"""
+
+        analysis = asyncio.Queue()
+        # Held so the event loop's weak reference isn't the only one
+        analysis_task = asyncio.create_task(stream_analysis(claude, prompt, analysis))
+
+
+    # ============================================================================
+    # STEP 2: Preview Search Results (FREE - No Credits Used)
+    # ============================================================================
+
+    print("\n" + BANNER)
+    print("STEP 2: PREVIEWING SEARCH RESULTS (No cost)")
+    print(BANNER, flush=True)
+
+    lead_count = cached_preview_count(search_filters)
+
+    if lead_count is not None:
+        print(f"\n✓ Found {lead_count:,} leads matching your criteria")
+        print(f"  (cached from the last {PREVIEW_CACHE_TTL // 60} minutes)")
     else:
-        print("✓ Lead count looks reasonable")
+        response = await preview(client, filters_compact)
 
+        if response.status_code != 200:
+            raise PreviewFailed(response.status_code, response.text)
 
-# ============================================================================
-# STEP 4: User Decision Point
-# ============================================================================
+        preview_data = orjson.loads(response.content)
+        lead_count = preview_data.get("count", 0)
+        cache_preview_count(search_filters, lead_count)
 
-print("\n" + "=" * 70)
-print("STEP 4: ENRICHMENT DECISION")
-print("=" * 70)
+        print(f"\n✓ Found {lead_count:,} leads matching your criteria")
+        print(f"  (via {response.http_version})")
 
-estimated_credits = int(lead_count * 1.5)  # Rough estimate
-estimated_cost = estimated_credits * 9 / 2000  # $9 per 2000 credits
 
-print(f"\nEstimated Cost for {lead_count:,} leads:")
-print(f"  • Credits: ~{estimated_credits:,}")
-print(f"  • USD: ~${estimated_cost:.2f}")
-print(f"\nThis includes:")
-print(f"  • Work email enrichment")
-print(f"  • Email verification")
+    # ============================================================================
+    # STEP 3: AI Analysis and Recommendations (Optional)
+    # ============================================================================
 
-proceed = input("\nProceed with enrichment? (yes/no): ").strip().lower()
+    print("\n" + BANNER)
+    print("STEP 3: AI ANALYSIS")
+    print(BANNER, flush=True)
 
-if proceed not in ['yes', 'y']:
-    print("\n✗ Enrichment cancelled")
-    print("\nTo refine your search:")
-    print("1. Adjust the search_filters in the script")
-    print("2. Run the script again to preview")
-    print("3. Repeat until satisfied")
-    exit(0)
+    if analysis is not None:
+        # Print whatever has been buffered, then keep streaming until it ends
+        print(f"\n🤖 Claude's Analysis ({lead_count:,} leads found):", flush=True)
+        while (chunk := await analysis.get()) is not None:
+            if isinstance(chunk, Exception):
+                print(f"\n⚠️  Could not get AI analysis: {chunk}")
+                print("Proceeding without AI recommendations...")
+            else:
+                print(chunk, end="", flush=True)
+        print()
+    else:
+        print("\n⚠️  No Anthropic API key provided - skipping AI analysis")
+        print(f"Manual assessment: {lead_count:,} leads found")
 
+        if lead_count > 10000:
+            print("⚠️  Large result set - consider narrowing filters to save credits")
+        elif lead_count > 0:
+            print("✓ Lead count looks reasonable")
 
-# ============================================================================
-# STEP 5: Execute Enrichment (COSTS CREDITS)
-# ============================================================================
+    # Checked after the analysis so its filter advice is still shown, but
+    # before STEP 4 so --yes can never start an empty enrichment
+    if lead_count == 0:
+        raise NoLeadsFound("No leads found - filters may be too restrictive")
 
-print("\n" + "=" * 70)
-print("STEP 5: EXECUTING ENRICHMENT")
-print("=" * 70)
 
-# Configure enrichment options
-enrichment_payload = {
-    "work_email_enrichment": True,
-    "email_verification": True,
-    "fully_enriched_profile": True,
-    "custom_flow": ["instantly"]  # Use Instantly's waterfall enrichment
-}
+    # ============================================================================
+    # STEP 4: User Decision Point
+    # ============================================================================
 
-# Set a reasonable limit (max 1000 for this example)
-enrichment_limit = min(lead_count, 1000)
-
-list_name = f"Colorado CEOs - {lead_count} leads"
-
-print(f"\nStarting enrichment...")
-print(f"  • List name: {list_name}")
-print(f"  • Leads to enrich: {enrichment_limit:,}")
-print(f"  • Enrichment options:")
-print(f"    - Work email enrichment: ✓")
-print(f"    - Email verification: ✓")
-print(f"    - Full profile: ✓")
-
-enrichment_response = requests.post(
-    f"{BASE_URL}/supersearch-enrichment/enrich-leads-from-supersearch",
-    headers=headers,
-    json={
-        "search_filters": search_filters,
-        "limit": enrichment_limit,
-        "list_name": list_name,
-        "enrichment_payload": enrichment_payload
-    }
-)
+    print("\n" + BANNER)
+    print("STEP 4: ENRICHMENT DECISION")
+    print(BANNER, flush=True)
 
-if enrichment_response.status_code != 200:
-    print(f"\n❌ Error starting enrichment: {enrichment_response.status_code}")
-    print(enrichment_response.text)
-    exit(1)
+    # Only up to --limit leads are enriched, so that is what gets charged
+    enrichment_limit = min(lead_count, args.limit)
 
-enrichment_data = enrichment_response.json()
+    estimated_credits, estimated_cost = PRICING.estimate(enrichment_limit)
 
-print("\n✅ Enrichment job started successfully!")
-print(f"\nJob Details:")
-print(f"  • Job ID: {enrichment_data.get('id')}")
-print(f"  • Resource ID: {enrichment_data.get('resource_id')}")
-print(f"  • Organization ID: {enrichment_data.get('organization_id')}")
+    print(f"\nEstimated Cost for {enrichment_limit:,} leads:")
+    print(f"  • Credits: ~{estimated_credits:,.0f}")
+    print(f"  • USD: ~${estimated_cost:.2f}")
+    print(f"\nThis includes:")
+    print(f"  • Work email enrichment")
+    print(f"  • Email verification")
 
+    if args.max_cost is not None and estimated_cost > args.max_cost:
+        raise CostLimitExceeded(
+            f"Estimated cost ${estimated_cost:.2f} exceeds --max-cost ${args.max_cost:.2f}"
+        )
 
-# ============================================================================
-# STEP 6: Check Status (Optional)
-# ============================================================================
+    if args.yes:
+        proceed = 'yes'
+        print("\n✓ Proceeding without confirmation (--yes)")
+    else:
+        proceed = input("\nProceed with enrichment? (yes/no): ").strip().lower()
 
-print("\n" + "=" * 70)
-print("STEP 6: CHECKING STATUS")
-print("=" * 70)
+    if proceed not in ['yes', 'y']:
+        print("\n✗ Enrichment cancelled")
+        print("\nTo refine your search:")
+        print("1. Adjust the search_filters in the script")
+        print("2. Run the script again to preview")
+        print("3. Repeat until satisfied")
+        return
 
-resource_id = enrichment_data.get('resource_id')
 
-if resource_id:
-    status_response = requests.get(
-        f"{BASE_URL}/supersearch-enrichment/{resource_id}",
-        headers=headers
-    )
-    
-    if status_response.status_code == 200:
-        status_data = status_response.json()
-        
-        print(f"\nEnrichment Status:")
-        print(f"  • In Progress: {status_data.get('in_progress')}")
-        print(f"  • Has Leads: {not status_data.get('has_no_leads')}")
-        print(f"  • Resource Type: {status_data.get('resource_type')}")
-        
-        if status_data.get('in_progress'):
-            print(f"\n⏳ Enrichment is still running...")
-            print(f"   Check your Instantly dashboard for updates")
+    # ============================================================================
+    # STEP 5: Execute Enrichment (COSTS CREDITS)
+    # ============================================================================
+
+    print("\n" + BANNER)
+    print("STEP 5: EXECUTING ENRICHMENT")
+    print(BANNER, flush=True)
+
+    list_name = f"Colorado CEOs - {lead_count} leads"
+
+    print(f"\nStarting enrichment...")
+    print(f"  • List name: {list_name}")
+    print(f"  • Leads to enrich: {enrichment_limit:,}")
+    print(f"  • Enrichment options:")
+    print(f"    - Work email enrichment: ✓")
+    print(f"    - Email verification: ✓")
+    print(f"    - Full profile: ✓", flush=True)
+
+    # Look for same-named lists while the enrichment request is in flight.
+    # lists_named never raises, so any group error came from the enrichment.
+    try:
+        async with asyncio.TaskGroup() as tg:
+            enrich_task = tg.create_task(enrich_leads(
+                filters_compact, client=client, limit=enrichment_limit, list_name=list_name
+            ))
+            names_task = tg.create_task(lists_named(client, list_name))
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0]
+
+    enrichment_data = enrich_task.result()
+
+    print("\n✅ Enrichment job started successfully!")
+    print(f"\nJob Details:")
+    print(f"  • Job ID: {enrichment_data.get('id')}")
+    print(f"  • Resource ID: {enrichment_data.get('resource_id')}")
+    print(f"  • Organization ID: {enrichment_data.get('organization_id')}")
+
+    # The new list may already show up in the search, so ignore its own ID
+    same_name = names_task.result()
+    if same_name and same_name - {enrichment_data.get('resource_id')}:
+        print(f"\n⚠️  Another list is already named \"{list_name}\" - rename one to tell them apart")
+
+
+    # ============================================================================
+    # STEP 6: Check Status (Optional)
+    # ============================================================================
+
+    print("\n" + BANNER)
+    print("STEP 6: WAITING FOR ENRICHMENT")
+    print(BANNER, flush=True)
+
+    resource_id = enrichment_data.get('resource_id')
+
+    if resource_id:
+        print(f"\n⏳ Polling status (up to 10 minutes)...", flush=True)
+        status_response = await wait_for_completion(client, resource_id)
+
+        if status_response.status_code == 200:
+            status_data = orjson.loads(status_response.content)
+
+            print(f"\nEnrichment Status:")
+            print(f"  • In Progress: {status_data.get('in_progress')}")
+            print(f"  • Has Leads: {not status_data.get('has_no_leads')}")
+            print(f"  • Resource Type: {status_data.get('resource_type')}")
+
+            if status_data.get('in_progress'):
+                print(f"\n⏳ Enrichment is still running after 10 minutes...")
+                print(f"   Check your Instantly dashboard for updates")
+            else:
+                print(f"\n✓ Enrichment complete!")
+                print(f"   View your list in Instantly: https://app.instantly.ai")
         else:
-            print(f"\n✓ Enrichment complete!")
-            print(f"   View your list in Instantly: https://app.instantly.ai")
-    else:
-        print(f"\n⚠️  Could not fetch status: {status_response.status_code}")
+            print(f"\n⚠️  Could not fetch status: {status_response.status_code}")
 
 
-# ============================================================================
-# STEP 7: Summary
-# ============================================================================
+    # ============================================================================
+    # STEP 7: Summary
+    # ============================================================================
 
-print("\n" + "=" * 70)
-print("ENRICHMENT COMPLETE - SUMMARY")
-print("=" * 70)
+    print("\n" + BANNER)
+    print("ENRICHMENT COMPLETE - SUMMARY")
+    print(BANNER, flush=True)
 
-print(f"""
+    print(f"""
 ✓ Successfully enriched {enrichment_limit:,} Colorado CEOs
 
 Next Steps:
@@ -294,4 +608,51 @@ You can now:
 • Further enrich with AI prompts
 """)
 
-print("=" * 70)
+    print(BANNER)
+
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+async def main(args):
+    prewarm_dns()
+
+    async with _make_client() as client:
+        await run(client, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find CEOs in Colorado and enrich them in Instantly.ai")
+    parser.add_argument(
+        "-y", "--yes",
+        action="store_true",
+        help="Start the enrichment without asking for confirmation"
+    )
+    parser.add_argument(
+        "--limit",
+        type=positive_int,
+        default=1000,
+        help="Maximum number of leads to enrich (default: 1000)"
+    )
+    parser.add_argument(
+        "--max-cost",
+        type=float,
+        metavar="USD",
+        help="Abort instead of enriching if the estimated cost is above this"
+    )
+    args = parser.parse_args()
+
+    # Block-buffer stdout even on a terminal; steps flush explicitly
+    sys.stdout.reconfigure(line_buffering=False)
+
+    try:
+        asyncio.run(main(args))
+    except InstantlyError as e:
+        # Raised inside the client's context, so its connections are already closed
+        print(f"\n❌ {e}")
+        sys.exit(e.exit_code)